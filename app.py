@@ -1,18 +1,25 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-from datetime import datetime
-import json
-import plotly.graph_objects as go
+import hashlib
+from collections import deque
+import os
+import time
+import urllib.request
+from pathlib import Path
+import orjson
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import requests
+
+from comodofi.core import (
+    TAKER_FEE_BPS, MAINT_MARGIN_RATIO, INVITE_CODE,
+    Series, funding_rate_last, empty_positions, minmax_downsample,
+)
 
 # ---- Page config (only once, first Streamlit call)
 st.set_page_config(page_title="Comodofi – MVP", page_icon="📊", layout="wide")
 
-# ---- Demo constants
-TAKER_FEE_BPS = 5            # 0.05% taker fee (demo)
-MAINT_MARGIN_RATIO = 0.005   # 0.5% maintenance margin (demo)
-INVITE_CODE = "COMODOFI2025"  # change if you want
-
 # ---- Access Gate (invite-only)
 if "auth_ok" not in st.session_state:
     st.session_state.auth_ok = False
@@ -34,66 +41,128 @@ if not st.session_state.auth_ok:
     st.stop()
 
 # ---- Config & index loading
-@st.cache_data
+@st.cache_resource(show_spinner=False)
 def load_config():
-    with open("indices.json", "r") as f:
-        return json.load(f)
-
-cfg = load_config()
-INDEX_MAP = {i["symbol"]: i for i in cfg["indices"]}
-symbols = list(INDEX_MAP.keys())
-
-@st.cache_data(ttl=60)
-def load_series(index_cfg):
-    src = index_cfg["source"]
-    if src["type"] == "csv":
-        df = pd.read_csv(src["path"])
-        tcol, vcol = src["time_field"], src["value_field"]
-        df[tcol] = pd.to_datetime(df[tcol])
-        df = df.sort_values(tcol).rename(columns={tcol: "time", vcol: "value"})
-        return df[["time", "value"]].reset_index(drop=True)
-    elif src["type"] == "url_csv":
-        df = pd.read_csv(src["url"])
-        tcol, vcol = src["time_field"], src["value_field"]
-        df[tcol] = pd.to_datetime(df[tcol])
-        df = df.sort_values(tcol).rename(columns={tcol: "time", vcol: "value"})
-        return df[["time", "value"]].reset_index(drop=True)
+    # Decode once per process with orjson (straight from bytes, no
+    # intermediate str) and build the symbol map alongside, so reruns
+    # don't rebuild INDEX_MAP. The returned singletons are mutable on
+    # purpose: "Add Index by URL" appends to them.
+    raw = orjson.loads(Path("indices.json").read_bytes())
+    idx_map = {i["symbol"]: i for i in raw["indices"]}
+    by_cat = {}
+    for i in raw["indices"]:
+        by_cat.setdefault(i.get("category", "Other"), []).append(i["symbol"])
+    return raw, idx_map, list(idx_map.keys()), by_cat
+
+cfg, INDEX_MAP, symbols, BY_CATEGORY = load_config()
+
+def _frozen_series(t, v):
+    t.setflags(write=False)
+    v.setflags(write=False)
+    return Series(t, v)
+
+SERIES_CACHE_DIR = Path(".series_cache")
+SERIES_CACHE_TTL = 3600  # on-disk copies outlive the 60s in-memory cache
+
+def _series_cache_key(src_type, location):
+    # Key by what identifies the bytes: path+mtime for local files,
+    # URL+ETag/Last-Modified for remote CSVs (so an unchanged sheet is
+    # never re-downloaded just because the memory cache expired).
+    if src_type == "csv":
+        ident = f"{location}:{os.path.getmtime(location)}"
+    else:
+        ident = location
+        try:
+            head = requests.head(location, timeout=5, allow_redirects=True)
+            ident += ":" + (head.headers.get("ETag") or head.headers.get("Last-Modified") or "")
+        except requests.RequestException:
+            pass
+    return hashlib.sha1(ident.encode()).hexdigest()
+
+@st.cache_resource(ttl=60, show_spinner=False)
+def load_series(src_type, location, tcol, vcol):
+    # Plain-string params keep the cache-key hash to four native strings
+    # instead of a walk over the nested index-config dict.
+    # cache_resource returns the singleton without the pickle copy that
+    # cache_data makes per call; the arrays are frozen, so callers must
+    # slice/copy rather than mutate.
+    cache_path = SERIES_CACHE_DIR / f"{_series_cache_key(src_type, location)}.parquet"
+    if cache_path.exists() and time.time() - cache_path.stat().st_mtime < SERIES_CACHE_TTL:
+        cached = pd.read_parquet(cache_path)
+        return _frozen_series(cached["time"].values.astype("datetime64[s]"), cached["value"].to_numpy())
+    # PyArrow parses in multithreaded C++ and types the timestamp column
+    # directly, so no pd.to_datetime pass is needed afterwards.
+    convert = pa_csv.ConvertOptions(
+        include_columns=[tcol, vcol],
+        column_types={tcol: pa.timestamp("ns"), vcol: pa.float64()},
+    )
+    if src_type == "csv":
+        table = pa_csv.read_csv(location, convert_options=convert)
+    elif src_type == "url_csv":
+        table = pa_csv.read_csv(urllib.request.urlopen(location), convert_options=convert)
     else:
         raise ValueError("Unsupported source type")
-
-def moving_avg(s, n=30):
-    return s.rolling(n, min_periods=1).mean()
-
-def funding_rate(price_series, lookback=30, k=0.0005):
-    ma = moving_avg(price_series, n=lookback)
-    premium = (price_series - ma) / ma.replace(0, np.nan)
-    return k * premium.fillna(0.0)
+    df = table.to_pandas()
+    t = df[tcol].values.astype("datetime64[s]")
+    # 4-decimal display precision: float32 halves the cache footprint.
+    # Wallet/qty arithmetic stays float64 at the call sites.
+    v = df[vcol].to_numpy(dtype=np.float32)
+    # Published time series are almost always chronological already; a
+    # single C-level pass over the int64 view decides whether the
+    # O(N log N) argsort is needed at all.
+    diffs = np.diff(t.view("i8"))
+    if diffs.size and not (diffs >= 0).all():
+        order = np.argsort(t, kind="stable")
+        t, v = t[order], v[order]
+    SERIES_CACHE_DIR.mkdir(exist_ok=True)
+    pd.DataFrame({"time": t, "value": v}).to_parquet(cache_path, compression="zstd")
+    return _frozen_series(t, v)
+
+def load_series_for(symbol):
+    # Destructure the source config so load_series is keyed on strings.
+    src = INDEX_MAP[symbol]["source"]
+    location = src["path"] if src["type"] == "csv" else src["url"]
+    return load_series(src["type"], location, src["time_field"], src["value_field"])
 
 def ensure_state():
     if "balances" not in st.session_state:
         st.session_state.balances = {"USD": 10000.0}
     if "positions" not in st.session_state:
-        st.session_state.positions = []
+        st.session_state.positions = empty_positions()
     if "log" not in st.session_state:
-        st.session_state.log = []
+        # Newest-first deque: appendleft keeps the Activity table ordered
+        # without a per-render sort.
+        st.session_state.log = deque()
+    if "log_version" not in st.session_state:
+        # Monotonic counter bumped on every append; keys the cached
+        # Activity frame/CSV so they rebuild only when the log changes.
+        st.session_state.log_version = 0
     if "session_scores" not in st.session_state:
         st.session_state.session_scores = {}
 ensure_state()
 
+@st.cache_resource
+def _logo():
+    # Read the SVG once per process; st.image with a path re-reads and
+    # re-hashes the file on every render.
+    return Path("logo.svg").read_text().strip()
+
 # ---- Sidebar (branding small + controls)
 with st.sidebar:
-    st.image("logo.svg", width=320)
+    st.image(_logo(), width=320)
     st.markdown("---")
 
     # Actions
     if st.button("🔄 Refresh data"):
         st.cache_data.clear()
+        st.cache_resource.clear()
         st.experimental_rerun()
 
     if st.button("🧹 Reset demo wallet to $10,000"):
         st.session_state.balances = {"USD": 10000.0}
-        st.session_state.positions = []
-        st.session_state.log = []
+        st.session_state.positions = empty_positions()
+        st.session_state.log = deque()
+        st.session_state.log_version += 1
         st.success("Wallet reset.")
         st.experimental_rerun()
 
@@ -107,8 +176,15 @@ with st.sidebar:
         _dec  = st.number_input("Decimals", 0, 6, 2)
         if st.button("Add index"):
             try:
-                test = pd.read_csv(_url)
-                cols = {c.lower() for c in test.columns}
+                # Fetch only the header row to validate the columns; the
+                # cached load_series does the real download on first use.
+                r = requests.get(_url, stream=True, timeout=5)
+                r.raise_for_status()
+                # Decode explicitly: iter_lines yields bytes when the
+                # server doesn't declare a text encoding.
+                header = next(r.iter_lines()).decode("utf-8", "replace")
+                r.close()
+                cols = {c.strip().strip('"').lower() for c in header.split(",")}
                 if not {"timestamp", "value"}.issubset(cols):
                     st.error("CSV must contain columns: timestamp, value")
                 else:
@@ -120,14 +196,14 @@ with st.sidebar:
                         "format": {"decimals": int(_dec), "unit": ""}
                     }
                     symbols.append(_sym)
+                    BY_CATEGORY.setdefault("Other", []).append(_sym)
                     st.success(f"Added {_sym}. Select it in the Index dropdown.")
             except Exception as e:
                 st.error(f"Could not load CSV: {e}")
 
     # Category + Index pickers (keep 'All' here if you want; request was about chart timeframe)
-    categories = sorted({INDEX_MAP[s].get("category", "Other") for s in symbols})
-    cat = st.selectbox("Category", ["All"] + categories)
-    filtered_symbols = [s for s in symbols if cat == "All" or INDEX_MAP[s].get("category") == cat]
+    cat = st.selectbox("Category", ["All"] + sorted(BY_CATEGORY))
+    filtered_symbols = symbols if cat == "All" else BY_CATEGORY[cat]
 
     symbol = st.selectbox(
         "Index",
@@ -135,48 +211,68 @@ with st.sidebar:
         format_func=lambda s: INDEX_MAP[s]["name"]
     )
 
-    # Trade controls
-    st.header("Trade")
-    lev = st.slider("Leverage", 1, 20, 5)
-    notional = st.number_input("Order Notional (USD)", min_value=10.0, value=500.0, step=10.0)
-    side = st.radio("Side", ["LONG", "SHORT"], horizontal=True)
-
 # ---- Front page hero (only one logo, bigger, centered) ----
 # ---- Front page hero (centered logo only) ----
 col1, col2, col3 = st.columns([1, 2, 1])
 with col2:
-    st.image("logo.svg", width=520)  # adjust size if you want
+    st.image(_logo(), width=520)  # adjust size if you want
 st.divider()
 
 
 # ---- Load selected index + metrics
-idx_cfg = INDEX_MAP[symbol]
-df = load_series(idx_cfg)
-mark = float(df["value"].iloc[-1])
-fr = funding_rate(df["value"]).iloc[-1] * 24 * 100  # 24h %
+@st.cache_data(ttl=60)
+def compute_marks(symbol):
+    # Mark + funding only depend on the loaded series, not on the trade
+    # widgets, so cache them per symbol instead of recomputing per rerun.
+    v = load_series_for(symbol).value
+    return float(v[-1]), funding_rate_last(v) * 24 * 100
+
+mark, fr = compute_marks(symbol)
+
+CHART_PERIODS = {
+    "1D": pd.Timedelta(days=1),
+    "1W": pd.Timedelta(weeks=1),
+    "1M": pd.Timedelta(days=30),
+    "3M": pd.Timedelta(days=90),
+    "1Y": pd.Timedelta(days=365),
+}
+
+@st.cache_data(ttl=60)
+def _window_starts(symbol):
+    # Start index of every timeframe window in one cached pass; the
+    # series is time-sorted, so each is a binary search.
+    t = load_series_for(symbol).time
+    last = t[-1]
+    return {tf: int(np.searchsorted(t, last - p.to_timedelta64()))
+            for tf, p in CHART_PERIODS.items()}
+
+@st.cache_data(ttl=60)
+def chart_arrays(symbol, tf):
+    # Windowed + downsampled (x, y) for the chart. Cached per (symbol, tf)
+    # so timeframe toggles are cache hits, and capped at ~1500 points so
+    # the payload to the browser stays small on long series.
+    s = load_series_for(symbol)
+    i = _window_starts(symbol)[tf]
+    x, y = s.time[i:], s.value[i:]
+    if x.size > 1500:
+        x, y = minmax_downsample(x, y)
+    return x, y
 
 # ---- Layout
 colA, colB = st.columns([3, 2], gap="large")
 
 # ---- Left: Asset name + Robinhood-style chart (no 'ALL' timeframe)
-with colA:
-    # Asset name
-    st.markdown(f"#### {idx_cfg['name']}")
+@st.experimental_fragment
+def render_chart(symbol):
+    # Fragment: the timeframe radio lives in here, so flipping it only
+    # reruns the chart block, not the whole script.
+    st.markdown(f"#### {INDEX_MAP[symbol]['name']}")
 
-    dfv = df.copy()
     tf = st.radio("Timeframe", ["1D", "1W", "1M", "3M", "1Y"], horizontal=True, index=2, label_visibility="collapsed")
-    periods = {
-        "1D": pd.Timedelta(days=1),
-        "1W": pd.Timedelta(weeks=1),
-        "1M": pd.Timedelta(days=30),
-        "3M": pd.Timedelta(days=90),
-        "1Y": pd.Timedelta(days=365),
-    }
-    start = dfv["time"].max() - periods[tf]
-    dfv = dfv[dfv["time"] >= start]
-
-    current = float(dfv["value"].iloc[-1])
-    first = float(dfv["value"].iloc[0])
+    chart_x, chart_y = chart_arrays(symbol, tf)
+
+    current = float(chart_y[-1])
+    first = float(chart_y[0])
     chg = current - first
     chg_pct = (chg / first) * 100 if first != 0 else 0.0
     up = chg >= 0
@@ -194,9 +290,13 @@ with colA:
     )
 
     # Minimal area chart
+    # Deferred: the access gate never draws a chart, so the login screen
+    # shouldn't pay for the plotly import (cached after the first call).
+    import plotly.graph_objects as go
+
     fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=dfv["time"], y=dfv["value"],
+    fig.add_trace(go.Scattergl(
+        x=chart_x, y=chart_y,
         mode="lines",
         line=dict(width=2, color=color),
         fill="tozeroy",
@@ -214,94 +314,159 @@ with colA:
     )
     st.plotly_chart(fig, use_container_width=True)
 
+with colA:
+    render_chart(symbol)
+
 # ---- Right: info metrics (NO "About this index" heading)
+@st.cache_data
+def static_about_block(symbol):
+    # The name/desc pair never changes for a symbol; cache it so the
+    # diff engine sees identical payloads on unrelated reruns.
+    return INDEX_MAP[symbol]["name"], INDEX_MAP[symbol]["desc"]
+
 with colB:
-    st.write(idx_cfg["desc"])
-    st.metric("Mark", f"{mark:.4f}")
-    st.metric("Est. 24h Funding", f"{fr:+.3f}%")
-    st.metric("USD Balance", f"${st.session_state.balances['USD']:.2f}")
+    st.write(static_about_block(symbol)[1])
+    # Live metrics go into placeholders so only these slots are updated.
+    mark_slot, funding_slot, balance_slot = st.empty(), st.empty(), st.empty()
+    mark_slot.metric("Mark", f"{mark:.4f}")
+    funding_slot.metric("Est. 24h Funding", f"{fr:+.3f}%")
+    balance_slot.metric("USD Balance", f"${st.session_state.balances['USD']:.2f}")
 
 st.divider()
 
 # ---- Place Order (with fee + liq preview)
-st.subheader("Place Order")
-c1, c2, c3, c4 = st.columns(4)
-c1.write(f"**Symbol**: {symbol}")
-c2.write(f"**Side**: {side}")
-c3.write(f"**Leverage**: {lev}x")
-c4.write(f"**Notional**: ${notional:,.2f}")
-
-# Fee + liquidation estimate
-entry = mark
-qty = (notional * lev) / entry * (1 if side == "LONG" else -1)
-fee = notional * (TAKER_FEE_BPS / 10_000)
-maint = MAINT_MARGIN_RATIO * notional
-liq_price = entry + (maint - (notional - fee)) / qty if qty != 0 else float("nan")
-
-lc1, lc2 = st.columns(2)
-lc1.metric("Est. taker fee", f"${fee:,.2f}")
-lc2.metric("Est. liq price", f"{liq_price:.4f}" if np.isfinite(liq_price) else "—")
+@st.cache_data(show_spinner=False)
+def _order_metrics(notional, lev, entry, side):
+    # Pure in its inputs, so identical widget states become cache hits
+    # and the formatted preview stays byte-stable for the diff engine.
+    sign = 1.0 if side == "LONG" else -1.0
+    qty = (notional * lev) / entry * sign
+    fee = notional * (TAKER_FEE_BPS / 10_000)
+    maint = MAINT_MARGIN_RATIO * notional
+    liq = entry + (maint - (notional - fee)) / qty if qty else float("nan")
+    return qty, fee, liq
 
 def open_position(symbol, side, notional, lev, entry_price):
     qty_local = (notional * lev) / entry_price
     if side == "SHORT":
         qty_local *= -1
     st.session_state.balances["USD"] -= notional
-    pos = {
-        "symbol": symbol, "qty": qty_local, "entry": entry_price,
-        "notional": notional, "lev": lev, "opened": datetime.utcnow().isoformat()
-    }
-    st.session_state.positions.append(pos)
-    st.session_state.log.append({
-        "time": datetime.utcnow(), "action": "OPEN", "symbol": symbol,
+    pos = st.session_state.positions
+    for field, val in (
+        ("symbol", symbol), ("qty", qty_local), ("entry", entry_price),
+        ("notional", notional), ("lev", lev),
+        ("opened_ns", time.time_ns()),
+    ):
+        pos[field] = np.append(pos[field], val)
+    st.session_state.log.appendleft({
+        "time_ns": time.time_ns(), "action": "OPEN", "symbol": symbol,
         "side": side, "price": entry_price, "notional": notional, "lev": lev
     })
+    st.session_state.log_version += 1
+
+@st.experimental_fragment
+def order_panel(symbol, mark):
+    # Fragment: the trade controls live in here (moved out of the
+    # sidebar), so leverage/notional/side tweaks rerun only this panel.
+    st.subheader("Place Order")
+    tc1, tc2, tc3 = st.columns(3)
+    lev = tc1.slider("Leverage", 1, 20, 5)
+    notional = tc2.number_input("Order Notional (USD)", min_value=10.0, value=500.0, step=10.0)
+    side = tc3.radio("Side", ["LONG", "SHORT"], horizontal=True)
+
+    c1, c2, c3, c4 = st.columns(4)
+    c1.write(f"**Symbol**: {symbol}")
+    c2.write(f"**Side**: {side}")
+    c3.write(f"**Leverage**: {lev}x")
+    c4.write(f"**Notional**: ${notional:,.2f}")
+
+    qty, fee, liq_price = _order_metrics(notional, lev, mark, side)
+    lc1, lc2 = st.columns(2)
+    lc1.metric("Est. taker fee", f"${fee:,.2f}")
+    lc2.metric("Est. liq price", f"{liq_price:.4f}" if np.isfinite(liq_price) else "—")
+
+    if st.button("Open Position"):
+        if notional > st.session_state.balances["USD"]:
+            st.error("Insufficient balance.")
+        else:
+            open_position(symbol, side, notional, lev, mark)
+            st.success(f"Opened {side} {symbol} at {mark:.4f}")
+            st.experimental_rerun()
 
-if st.button("Open Position"):
-    if notional > st.session_state.balances["USD"]:
-        st.error("Insufficient balance.")
-    else:
-        open_position(symbol, side, notional, lev, mark)
-        st.success(f"Opened {side} {symbol} at {mark:.4f}")
-        st.experimental_rerun()
+order_panel(symbol, mark)
 
 st.divider()
 
 # ---- Open Positions
-st.subheader("Open Positions")
-if len(st.session_state.positions) == 0:
-    st.info("No open positions.")
-else:
-    rows = []
-    for pos in st.session_state.positions:
-        cur_mark = mark if pos["symbol"] == symbol else mark  # simple MVP mark
-        pnl = (cur_mark - pos["entry"]) * pos["qty"]
-        rows.append({
-            "Symbol": pos["symbol"], "Qty": pos["qty"], "Entry": pos["entry"],
-            "Mark": cur_mark, "Unreal. PnL": pnl
+@st.experimental_fragment
+def render_positions(mark):
+    # Fragment: trade-control reruns skip the table rebuild; the close
+    # buttons still trigger a full rerun so balances refresh everywhere.
+    st.subheader("Open Positions")
+    pos = st.session_state.positions
+    n_pos = pos["qty"].size
+    if n_pos == 0:
+        st.info("No open positions.")
+        return
+    pnls = (mark - pos["entry"]) * pos["qty"]  # simple MVP mark for all symbols
+    # Explicit dtypes: the symbol column would otherwise land as object,
+    # costing dtype inference here and Arrow serialization in st.dataframe.
+    st.dataframe(pd.DataFrame({
+        "Symbol": pd.array(pos["symbol"], dtype="string"),
+        "Qty": pos["qty"], "Entry": pos["entry"],
+        "Mark": np.full(n_pos, mark), "Unreal. PnL": pnls
+    }), use_container_width=True)
+
+    # One selectbox + one button instead of a button per position: widget
+    # count stays constant no matter how many positions are open.
+    labels = [
+        f"{pos['symbol'][i]} qty={pos['qty'][i]:.3f} entry={pos['entry'][i]:.4f}"
+        for i in range(n_pos)
+    ]
+    choice = st.selectbox("Close which position?", range(n_pos), format_func=lambda i: labels[i])
+    close_idx = choice if st.button(f"Close selected @ {mark:.4f}") else None
+    if close_idx is not None:
+        pnl = float(pnls[close_idx])
+        closed_symbol = pos["symbol"][close_idx]
+        st.session_state.balances["USD"] += float(pos["notional"][close_idx]) + pnl
+        st.session_state.log.appendleft({
+            "time_ns": time.time_ns(), "action": "CLOSE",
+            "symbol": closed_symbol, "pnl": pnl, "price": mark
         })
-    st.dataframe(pd.DataFrame(rows), use_container_width=True)
-
-    for i, pos in enumerate(list(st.session_state.positions)):
-        if st.button(f"Close {pos['symbol']} @ {mark:.4f}", key=f"close_{i}"):
-            pnl = (mark - pos["entry"]) * pos["qty"]
-            st.session_state.balances["USD"] += pos["notional"] + pnl
-            st.session_state.log.append({
-                "time": datetime.utcnow(), "action": "CLOSE",
-                "symbol": pos["symbol"], "pnl": pnl, "price": mark
-            })
-            st.session_state.positions.pop(i)
-            st.success(f"Closed {pos['symbol']} PnL {pnl:+.2f} USD")
-            st.experimental_rerun()
+        st.session_state.log_version += 1
+        # Swap-remove: row order doesn't matter, so O(1) per column
+        # instead of np.delete rebuilding each array.
+        for field in pos:
+            pos[field][close_idx] = pos[field][-1]
+            pos[field] = pos[field][:-1]
+        st.success(f"Closed {closed_symbol} PnL {pnl:+.2f} USD")
+        st.experimental_rerun()
+
+render_positions(mark)
 
 st.divider()
 
 # ---- Activity (with download)
+def _log_df():
+    # The log is session-local, so the rendered frame lives in
+    # session_state (st.cache_data is process-global and would serve one
+    # session's trades to another). log_version says when to rebuild.
+    if st.session_state.get("log_df_version") != st.session_state.log_version:
+        df = pd.DataFrame(list(st.session_state.log))
+        df.insert(0, "time", pd.to_datetime(df.pop("time_ns"), unit="ns", utc=True))
+        st.session_state.log_df = df
+        st.session_state.log_csv = df.to_csv(index=False).encode("utf-8")
+        st.session_state.log_df_version = st.session_state.log_version
+    return st.session_state.log_df
+
 st.subheader("Activity")
 if len(st.session_state.log) == 0:
     st.info("No activity yet.")
 else:
-    log_df = pd.DataFrame(st.session_state.log).sort_values("time", ascending=False)
-    st.dataframe(log_df, use_container_width=True)
-    csv = log_df.to_csv(index=False).encode("utf-8")
-    st.download_button("⬇️ Download trade log (CSV)", csv, "comodofi_trades.csv", "text/csv")
+    st.dataframe(_log_df(), use_container_width=True)
+    st.download_button(
+        "⬇️ Download trade log (CSV)",
+        st.session_state.log_csv,
+        "comodofi_trades.csv",
+        "text/csv",
+    )
@@ -0,0 +1,75 @@
+# Shared constants and pure numeric helpers for the Comodofi app.
+# Nothing in here touches Streamlit, so it imports once and stays out of
+# the per-rerun script body.
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+# ---- Demo constants
+TAKER_FEE_BPS = 5            # 0.05% taker fee (demo)
+MAINT_MARGIN_RATIO = 0.005   # 0.5% maintenance margin (demo)
+INVITE_CODE = "COMODOFI2025"  # change if you want
+
+class Series(NamedTuple):
+    # Two contiguous ndarrays instead of a DataFrame: cache hits only have
+    # to pickle the raw buffers, with no index reconstruction.
+    time: np.ndarray   # datetime64[s], ascending
+    value: np.ndarray  # float32
+
+def rolling_mean(x, n):
+    # Prefix-sum rolling mean; matches rolling(n, min_periods=1).mean()
+    # in one vectorized pass, with no compiled-kernel dependency.
+    c = np.concatenate(([0.0], np.cumsum(x, dtype=np.float64)))
+    idx = np.arange(x.size)
+    start = np.maximum(idx + 1 - n, 0)
+    return (c[idx + 1] - c[start]) / (idx + 1 - start)
+
+def moving_avg(s, n=30):
+    return pd.Series(rolling_mean(s.to_numpy(dtype=np.float64), n), index=s.index)
+
+def funding_rate(values, lookback=30, k=0.0005):
+    # Full-series variant (chart overlays etc.); operates on the raw
+    # ndarray so no intermediate Series are allocated.
+    v = np.asarray(values, dtype=np.float64)
+    ma = rolling_mean(v, lookback)
+    # Masked divide: never touches the zero-MA lanes, unlike np.where,
+    # which evaluates the division everywhere first.
+    premium = np.zeros_like(v)
+    np.divide(v - ma, ma, out=premium, where=(ma != 0.0))
+    return k * premium
+
+def funding_rate_last(values, lookback=30, k=0.0005):
+    # Same premium formula as funding_rate, but only for the latest point:
+    # avoids the full rolling pass when just one number is needed.
+    tail = values[-lookback:]
+    ma = tail.mean()
+    return 0.0 if ma == 0 else k * (values[-1] - ma) / ma
+
+def empty_positions():
+    # Positions are stored column-wise (struct-of-arrays) so the table and
+    # PnL are vectorized expressions instead of per-row dict building.
+    return {
+        "symbol": np.empty(0, dtype=object),
+        "qty": np.empty(0, dtype=np.float64),
+        "entry": np.empty(0, dtype=np.float64),
+        "notional": np.empty(0, dtype=np.float64),
+        "lev": np.empty(0, dtype=np.float64),
+        "opened_ns": np.empty(0, dtype=np.int64),
+    }
+
+def minmax_downsample(x, y, n_out=1500):
+    # Keep each bucket's min and max instead of a plain stride, so spikes
+    # survive decimation; ~n_out points go to the browser regardless of N.
+    w = int(np.ceil(x.size / (n_out // 2)))
+    n_bins = x.size // w
+    yb = y[:n_bins * w].reshape(n_bins, w)
+    offs = np.arange(n_bins, dtype=np.int64) * w
+    idx = np.concatenate((
+        yb.argmin(axis=1) + offs,
+        yb.argmax(axis=1) + offs,
+        np.arange(n_bins * w, x.size, dtype=np.int64),  # ragged tail
+        [0, x.size - 1],  # endpoints feed the period-change header
+    ))
+    idx = np.unique(idx)
+    return x[idx], y[idx]